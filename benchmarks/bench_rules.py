@@ -0,0 +1,74 @@
+"""Compare rule evaluation throughput with the plain extension lookup.
+
+Usage: python benchmarks/bench_rules.py [files]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cleaner import DEFAULT_CATEGORIES, RuleSet, get_category  # noqa: E402
+
+EXTENSIONS = [".jpg", ".pdf", ".mp4", ".zip", ".py", ".txt", ".bin", ".docx"]
+PREFIXES = ["invoice_", "IMG_", "report_", "backup_", "notes_"]
+
+EXTENSION_RULES = [{"category": cat, "extension": exts} for cat, exts in DEFAULT_CATEGORIES.items()]
+NAME_RULES = [
+    {"category": "Finance", "name": ["invoice_*", "receipt_*"]},
+    {"category": "Backups", "name": "backup_*"},
+] + EXTENSION_RULES
+STAT_RULES = NAME_RULES[:2] + [
+    {"category": "Large", "min_size": "1G"},
+    {"category": "Archive", "older_than_days": 90},
+] + EXTENSION_RULES
+GATED_STAT_RULES = NAME_RULES[:2] + [
+    {"category": "Large", "extension": [".bin", ".iso"], "min_size": "1G"},
+] + EXTENSION_RULES
+
+
+def make_files(folder: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        path = folder / f"{PREFIXES[i % len(PREFIXES)]}{i}{EXTENSIONS[i % len(EXTENSIONS)]}"
+        path.touch()
+        paths.append(path)
+    return paths
+
+
+def measure(label: str, func, paths: list) -> None:
+    started = time.perf_counter()
+    for path in paths:
+        func(path)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {len(paths) / elapsed:>12,.0f} files/s")
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        # Reuse a few thousand real files so stat() hits the filesystem without creating millions.
+        real = make_files(Path(tmp), min(total, 5000))
+        paths = [real[i % len(real)] for i in range(total)]
+
+        print(f"{total:,} files\n")
+        measure(
+            "get_category (extension lookup)",
+            lambda p: get_category(os.path.splitext(p.name)[1], DEFAULT_CATEGORIES),
+            paths,
+        )
+        for label, rules in (
+            ("rules: extension only", EXTENSION_RULES),
+            ("rules: name + extension", NAME_RULES),
+            ("rules: size/age (stat per file)", STAT_RULES),
+            ("rules: size gated by extension", GATED_STAT_RULES),
+        ):
+            rule_set = RuleSet.compile(rules)
+            measure(label, rule_set.match, paths)
+
+
+if __name__ == "__main__":
+    main()
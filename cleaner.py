@@ -3,17 +3,25 @@
 from __future__ import annotations
 
 import argparse
+import ctypes
 import json
 import logging
+import math
 import mimetypes
 import os
+import platform
+import re
 import shutil
+import stat
 import sys
+import tempfile
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from fnmatch import fnmatch
+from fnmatch import translate as fnmatch_translate
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple, Union
 
 # ================= CONSTANTS =================
 
@@ -23,6 +31,17 @@ HISTORY_FILE = "move_history.json"
 AUTHOR_NAME = "Thanh Nguyen"
 AUTHOR_EMAIL = "thanhnguyentuan2007@gmail.com"
 
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASSES = {"low": (2, 7), "idle": (3, 0)}  # name -> (class, level)
+IOPRIO_SET_SYSCALLS = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "armv7l": 314, "ppc64le": 273}
+
+CALIBRATION_PROBE_BYTES = 4 * 1024 * 1024
+FREE_SPACE_RESERVE = 64 * 1024 * 1024  # headroom kept free (capped at 5% of free space)
+
+RULE_NAME_KEYS = {"extension", "name"}
+RULE_STAT_KEYS = {"min_size", "max_size", "older_than_days", "newer_than_days"}
+
 IGNORED_DIRS = {'.git', '.idea', '.vscode', '__pycache__', 'node_modules', 'venv', 'env', '.svn', 'AppData'}
 
 DEFAULT_CATEGORIES = {
@@ -53,6 +72,12 @@ class OrganizerSettings:
     max_depth: Optional[int] = None
     console_log: bool = False
     report_path: Optional[Path] = None
+    files_from: Optional[Path] = None  # path list file, or "-" for stdin
+    max_bytes_per_sec: Optional[float] = None
+    max_ops_per_sec: Optional[float] = None
+    io_priority: Optional[str] = None  # low | idle
+    adaptive_throttle: bool = False
+    rules_path: Optional[Path] = None
 
 
 @dataclass
@@ -63,6 +88,14 @@ class RunSummary:
     renamed: int = 0
     skipped: int = 0
     by_category: Dict[str, int] = field(default_factory=dict)
+    bytes_transferred: int = 0
+    transfer_seconds: float = 0.0
+    throttled_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        elapsed = self.transfer_seconds + self.throttled_seconds
+        return self.bytes_transferred / elapsed if elapsed else 0.0
 
     def to_dict(self) -> Dict[str, object]:
         return {
@@ -72,6 +105,62 @@ class RunSummary:
             "renamed": self.renamed,
             "skipped": self.skipped,
             "by_category": self.by_category,
+            "bytes_transferred": self.bytes_transferred,
+            "transfer_seconds": round(self.transfer_seconds, 3),
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "throughput_bytes_per_sec": round(self.throughput, 1),
+        }
+
+
+@dataclass
+class PreflightEstimate:
+    files: int = 0
+    total_bytes: int = 0
+    rename_ops: int = 0
+    copy_ops: int = 0
+    copy_bytes: int = 0
+    free_bytes: Optional[int] = None
+    copy_rate: Optional[float] = None  # bytes/s measured by the calibration probe
+    op_seconds: Optional[float] = None  # per-operation overhead measured by the probe
+
+    def add(self, size: int, same_device: bool, mode: str) -> None:
+        self.files += 1
+        self.total_bytes += size
+        if mode == "move" and same_device:
+            self.rename_ops += 1
+        else:
+            self.copy_ops += 1
+            self.copy_bytes += size
+
+    @property
+    def fits(self) -> bool:
+        if self.free_bytes is None:
+            return True
+        reserve = min(FREE_SPACE_RESERVE, self.free_bytes // 20)
+        return self.copy_bytes + reserve <= self.free_bytes
+
+    @property
+    def estimated_seconds(self) -> Optional[float]:
+        if self.op_seconds is None:
+            return None
+        seconds = (self.rename_ops + self.copy_ops) * self.op_seconds
+        if self.copy_bytes:
+            if not self.copy_rate:
+                return None
+            seconds += self.copy_bytes / self.copy_rate
+        return seconds
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "files": self.files,
+            "total_bytes": self.total_bytes,
+            "rename_ops": self.rename_ops,
+            "copy_ops": self.copy_ops,
+            "copy_bytes": self.copy_bytes,
+            "free_bytes": self.free_bytes,
+            "calibrated_bytes_per_sec": round(self.copy_rate, 1) if self.copy_rate else None,
+            "estimated_seconds": round(self.estimated_seconds, 3) if self.estimated_seconds is not None else None,
+            "fits": self.fits,
         }
 
 # ================= LOGGING =================
@@ -128,6 +217,12 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Merge custom config with built-in defaults instead of replacing them",
     )
+    parser.add_argument(
+        "--rules",
+        type=Path,
+        metavar="FILE",
+        help="JSON list of size/age/name rules checked before extension categories",
+    )
     parser.add_argument(
         "--exclude",
         action="append",
@@ -155,6 +250,37 @@ def parse_arguments() -> argparse.Namespace:
         type=int,
         help="Limit recursion depth when scanning (0 processes only the root folder)",
     )
+    parser.add_argument(
+        "--files-from",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "Organize only the paths listed in FILE (newline- or NUL-separated, '-' for stdin) instead of scanning; "
+            "relative paths are resolved against the current directory"
+        ),
+    )
+    parser.add_argument(
+        "--max-bytes-per-sec",
+        type=parse_size,
+        metavar="SIZE",
+        help="Limit data copied per second (e.g. 50M, 1G); same-disk renames are not counted",
+    )
+    parser.add_argument(
+        "--max-ops-per-sec",
+        type=parse_rate,
+        metavar="N",
+        help="Limit move/copy operations per second",
+    )
+    parser.add_argument(
+        "--io-priority",
+        choices=sorted(IOPRIO_CLASSES),
+        help="Lower this process's disk I/O priority (Linux only)",
+    )
+    parser.add_argument(
+        "--adaptive-throttle",
+        action="store_true",
+        help="Back off automatically when file operations start taking longer",
+    )
     parser.add_argument(
         "--report",
         type=Path,
@@ -215,6 +341,178 @@ def load_categories(config_path: Path = Path(CONFIG_FILE), merge_defaults: bool
     return DEFAULT_CATEGORIES
 
 
+# ================= RULES =================
+
+@dataclass
+class CompiledRule:
+    category: str
+    extensions: Optional[frozenset] = None
+    name_pattern: Optional[Pattern[str]] = None
+    min_size: Optional[float] = None
+    max_size: Optional[float] = None
+    mtime_before: Optional[float] = None  # from older_than_days
+    mtime_after: Optional[float] = None  # from newer_than_days
+
+    @property
+    def needs_stat(self) -> bool:
+        return any(
+            limit is not None for limit in (self.min_size, self.max_size, self.mtime_before, self.mtime_after)
+        )
+
+    def matches_stat(self, file_stat: os.stat_result) -> bool:
+        if self.min_size is not None and file_stat.st_size < self.min_size:
+            return False
+        if self.max_size is not None and file_stat.st_size > self.max_size:
+            return False
+        if self.mtime_before is not None and file_stat.st_mtime >= self.mtime_before:
+            return False
+        if self.mtime_after is not None and file_stat.st_mtime <= self.mtime_after:
+            return False
+        return True
+
+
+# A stage is an extension table, a combined name regex, or a single rule needing several checks.
+RuleStage = Union[Dict[str, str], Tuple[Pattern[str], Dict[str, str]], CompiledRule]
+
+
+class RuleSet:
+    """Ordered rules compiled once into stages; the first matching rule wins.
+
+    Runs of extension-only rules collapse into one dict lookup and runs of name-only
+    rules into one regex, so most files are decided without touching the disk. Only
+    rules with size/age conditions call ``stat()``, at most once per file and only
+    after their extension and name checks pass.
+    """
+
+    def __init__(self, stages: List[RuleStage], categories: List[str]) -> None:
+        self.stages = stages
+        self.categories = categories
+        self.needs_stat = any(isinstance(stage, CompiledRule) and stage.needs_stat for stage in stages)
+
+    @classmethod
+    def compile(cls, rules: List[dict], now: Optional[float] = None) -> "RuleSet":
+        now = time.time() if now is None else now
+        compiled = [compile_rule(rule, now) for rule in rules]
+        stages: List[RuleStage] = []
+        for rule in compiled:
+            only_extensions = rule.name_pattern is None and not rule.needs_stat
+            only_name = rule.extensions is None and not rule.needs_stat
+            previous = stages[-1] if stages else None
+            if only_extensions and rule.extensions is not None:
+                if not isinstance(previous, dict):
+                    previous = {}
+                    stages.append(previous)
+                for ext in rule.extensions:
+                    previous.setdefault(ext, rule.category)
+            elif only_name and rule.name_pattern is not None:
+                if isinstance(previous, tuple):
+                    stages.pop()
+                    pattern_text, groups = previous[0].pattern + "|", previous[1]
+                else:
+                    pattern_text, groups = "", {}
+                # Alternation tries groups left to right, so the earliest rule still wins.
+                group = f"r{len(groups)}"
+                groups[group] = rule.category
+                pattern_text += f"(?P<{group}>{rule.name_pattern.pattern})"
+                stages.append((re.compile(pattern_text, re.IGNORECASE), groups))
+            else:
+                stages.append(rule)
+        categories = list(dict.fromkeys(rule.category for rule in compiled))
+        return cls(stages, categories)
+
+    def match(self, file_path: Path, file_stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """Return the first matching category; ``file_stat`` is reused instead of calling ``stat()`` again."""
+        name = file_path.name
+        extension = os.path.splitext(name)[1].lower()
+        stat_failed = False
+        for stage in self.stages:
+            if isinstance(stage, dict):
+                category = stage.get(extension)
+                if category:
+                    return category
+            elif isinstance(stage, tuple):
+                found = stage[0].match(name)
+                if found:
+                    return stage[1][found.lastgroup]
+            else:
+                if stage.extensions is not None and extension not in stage.extensions:
+                    continue
+                if stage.name_pattern is not None and not stage.name_pattern.match(name):
+                    continue
+                if stage.needs_stat:
+                    if file_stat is None and not stat_failed:
+                        try:
+                            file_stat = file_path.stat()
+                        except OSError as e:
+                            logging.warning(f"Cannot stat {file_path} for rules: {e}")
+                            stat_failed = True
+                    # Without stat data the rule cannot match; later stat-free rules still apply.
+                    if file_stat is None or not stage.matches_stat(file_stat):
+                        continue
+                return stage.category
+        return None
+
+
+def compile_rule(rule: dict, now: float) -> CompiledRule:
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rule must be an object: {rule!r}")
+    category = rule.get("category")
+    if not isinstance(category, str) or not category.strip():
+        raise ValueError(f"Rule is missing a category: {rule!r}")
+    unknown = set(rule) - RULE_NAME_KEYS - RULE_STAT_KEYS - {"category"}
+    if unknown:
+        raise ValueError(f"Unknown rule keys {sorted(unknown)} in rule for '{category}'")
+    if not set(rule) & (RULE_NAME_KEYS | RULE_STAT_KEYS):
+        raise ValueError(f"Rule for '{category}' has no conditions")
+
+    compiled = CompiledRule(category=category)
+    if "extension" in rule:
+        exts = rule["extension"] if isinstance(rule["extension"], list) else [rule["extension"]]
+        if not exts or not all(isinstance(ext, str) and ext.startswith(".") for ext in exts):
+            raise ValueError(f"Invalid extension in rule for '{category}'")
+        compiled.extensions = frozenset(ext.lower() for ext in exts)
+    if "name" in rule:
+        names = rule["name"] if isinstance(rule["name"], list) else [rule["name"]]
+        if not names or not all(isinstance(n, str) and n for n in names):
+            raise ValueError(f"Invalid name pattern in rule for '{category}'")
+        compiled.name_pattern = re.compile("|".join(fnmatch_translate(n) for n in names), re.IGNORECASE)
+    try:
+        for key in RULE_STAT_KEYS & set(rule):
+            if isinstance(rule[key], bool):
+                raise ValueError(f"{key} cannot be a boolean")
+        if "min_size" in rule:
+            compiled.min_size = parse_size(str(rule["min_size"]))
+        if "max_size" in rule:
+            compiled.max_size = parse_size(str(rule["max_size"]))
+        if "older_than_days" in rule:
+            compiled.mtime_before = now - parse_days(rule["older_than_days"]) * 86400
+        if "newer_than_days" in rule:
+            compiled.mtime_after = now - parse_days(rule["newer_than_days"]) * 86400
+    except (TypeError, ValueError, argparse.ArgumentTypeError) as e:
+        raise ValueError(f"Invalid size/age condition in rule for '{category}': {e}") from None
+    return compiled
+
+
+def parse_days(value: object) -> float:
+    days = float(value)  # type: ignore[arg-type]
+    if not math.isfinite(days) or days < 0:
+        raise ValueError(f"day count must be a non-negative number: {value!r}")
+    return days
+
+
+def load_rules(rules_path: Path) -> Optional[RuleSet]:
+    try:
+        with rules_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError("Invalid structure, should be a list of rules.")
+        return RuleSet.compile(data)
+    except Exception as e:  # pylint: disable=broad-except
+        print(f"[X] Failed to load rules from {rules_path}: {e}")
+        logging.error(f"Invalid rules file: {e}")
+        return None
+
+
 # ================= HELPERS =================
 
 def get_unique_filename(folder: Path, filename: str, max_attempts: int = 1000) -> str:
@@ -229,6 +527,32 @@ def get_unique_filename(folder: Path, filename: str, max_attempts: int = 1000) -
     return new_name
 
 
+def parse_size(value: str) -> float:
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    text = value.strip().upper().rstrip("B")
+    multiplier = 1
+    if text and text[-1] in units:
+        multiplier = units[text[-1]]
+        text = text[:-1]
+    try:
+        size = float(text) * multiplier
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}") from None
+    if not math.isfinite(size) or size <= 0:
+        raise argparse.ArgumentTypeError(f"size must be a positive number: {value}")
+    return size
+
+
+def parse_rate(value: str) -> float:
+    try:
+        rate = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rate: {value}") from None
+    if not math.isfinite(rate) or rate <= 0:
+        raise argparse.ArgumentTypeError(f"rate must be a positive number: {value}")
+    return rate
+
+
 def get_category(extension: str, categories: Dict[str, List[str]], filepath: Optional[Path] = None) -> str:
     extension = extension.lower()
     for category, exts in categories.items():
@@ -271,6 +595,195 @@ def matches_exclude(path: Path, patterns: Iterable[str]) -> bool:
     return any(fnmatch(path.name, pattern) or fnmatch(str(path), pattern) for pattern in patterns)
 
 
+def read_path_list(stream: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield entries of a newline- or NUL-separated path list without reading it all at once."""
+    separator: Optional[bytes] = None
+    buffer = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        if separator is None:
+            if b"\0" in buffer:
+                separator = b"\0"
+            elif b"\n" in buffer:
+                separator = b"\n"
+            else:
+                continue
+        *entries, buffer = buffer.split(separator)
+        for entry in entries:
+            if separator == b"\n":
+                entry = entry.rstrip(b"\r")
+            if entry:
+                yield os.fsdecode(entry)
+    if separator != b"\0":
+        buffer = buffer.rstrip(b"\r\n")
+    if buffer:
+        yield os.fsdecode(buffer)
+
+
+def iter_tree_files(root_path: Path, settings: OrganizerSettings, pruned_dirs: Set[Path]) -> Iterator[Path]:
+    for root, dirs, files in os.walk(root_path):
+        current = Path(root)
+        depth = len(current.relative_to(root_path).parts)
+        if settings.max_depth is not None and depth >= settings.max_depth:
+            dirs[:] = []
+
+        dirs[:] = [
+            d
+            for d in dirs
+            if d not in IGNORED_DIRS
+            and (settings.include_hidden or not d.startswith("."))
+            and not matches_exclude(current / d, settings.exclude_patterns)
+            and (current / d) not in pruned_dirs
+        ]
+
+        for filename in files:
+            yield current / filename
+
+
+def iter_listed_files(
+    list_source: Path,
+    root_path: Path,
+    settings: OrganizerSettings,
+    pruned_dirs: Set[Path],
+    summary: RunSummary,
+) -> Iterator[Path]:
+    """Yield listed files (relative entries resolve against the current directory) that a tree scan would reach."""
+    from_stdin = str(list_source) == "-"
+    stream = sys.stdin.buffer if from_stdin else list_source.open("rb")
+    resolved_folders: Dict[Path, Path] = {}
+    try:
+        for entry in read_path_list(stream):
+            # Resolve the folder (root_path is resolved too) but keep the file name, so listed symlinks stay put.
+            # Lists usually share a handful of folders, so each one is resolved only once.
+            listed = Path(os.path.abspath(entry))
+            parent = resolved_folders.get(listed.parent)
+            if parent is None:
+                parent = resolved_folders[listed.parent] = listed.parent.resolve()
+            file_path = parent / listed.name
+            try:
+                folders = file_path.relative_to(root_path).parts[:-1]
+            except ValueError:
+                logging.warning(f"Listed path outside {root_path}, skipping: {file_path}")
+                summary.skipped += 1
+                continue
+
+            if not file_path.is_file():
+                logging.warning(f"Listed path is not a file, skipping: {file_path}")
+                summary.skipped += 1
+                continue
+
+            if settings.max_depth is not None and len(folders) > settings.max_depth:
+                summary.skipped += 1
+                continue
+
+            folder = root_path
+            allowed = True
+            for part in folders:
+                folder = folder / part
+                if (
+                    part in IGNORED_DIRS
+                    or (not settings.include_hidden and part.startswith("."))
+                    or matches_exclude(folder, settings.exclude_patterns)
+                    or folder in pruned_dirs
+                ):
+                    allowed = False
+                    break
+            if not allowed:
+                summary.skipped += 1
+                continue
+
+            yield file_path
+    finally:
+        if not from_stdin:
+            stream.close()
+
+
+def iter_candidates(
+    root_path: Path,
+    settings: OrganizerSettings,
+    pruned_dirs: Set[Path],
+    summary: RunSummary,
+    list_source: Optional[Path] = None,
+) -> Iterator[Path]:
+    if list_source is not None:
+        return iter_listed_files(list_source, root_path, settings, pruned_dirs, summary)
+    return iter_tree_files(root_path, settings, pruned_dirs)
+
+
+def plan_operations(
+    candidates: Iterable[Path],
+    categories: Dict[str, List[str]],
+    destination_root: Path,
+    settings: OrganizerSettings,
+    summary: RunSummary,
+    rules: Optional[RuleSet] = None,
+) -> Iterator[Tuple[Path, str, Path, os.stat_result]]:
+    """Filter candidate files and yield ``(file_path, category, target_folder, stat)`` for each one to organize.
+
+    Each file is stat-ed once here; rules, the pre-flight estimate and the transfer step all reuse it.
+    """
+    current_script = Path(sys.argv[0]).name
+    for file_path in candidates:
+        filename = file_path.name
+        if not settings.include_hidden and filename.startswith("."):
+            summary.skipped += 1
+            continue
+
+        if filename in {current_script, LOG_FILE, HISTORY_FILE, CONFIG_FILE}:
+            summary.skipped += 1
+            continue
+
+        if matches_exclude(file_path, settings.exclude_patterns):
+            summary.skipped += 1
+            continue
+
+        try:
+            # lstat so symlinks are sized, placed and moved as links, like shutil.move does.
+            file_stat = file_path.lstat()
+        except OSError as e:
+            logging.warning(f"Cannot stat {file_path}, skipping: {e}")
+            summary.skipped += 1
+            continue
+
+        summary.total_scanned += 1
+
+        # Size/age rules look at a symlink's target, so let them stat it themselves.
+        rule_stat = None if stat.S_ISLNK(file_stat.st_mode) else file_stat
+        category = rules.match(file_path, rule_stat) if rules else None
+        if category is None:
+            _, extension = os.path.splitext(filename)
+            category = get_category(extension, categories, filepath=file_path)
+        target_folder = destination_root / category
+
+        if file_path.parent == target_folder:
+            summary.skipped += 1
+            continue
+
+        summary.by_category[category] = summary.by_category.get(category, 0) + 1
+        yield file_path, category, target_folder, file_stat
+
+
+def remove_empty_parents(folders: Iterable[Path], stop_at: Path) -> None:
+    """Remove empty folders upwards from each given folder, never touching ``stop_at``."""
+    for folder in sorted(set(folders), key=lambda p: len(p.parts), reverse=True):
+        current = folder
+        while current != stop_at and stop_at in current.parents:
+            if current.name in IGNORED_DIRS:
+                break
+            try:
+                if os.listdir(current):
+                    break
+                os.rmdir(current)
+                logging.info(f"Removed empty folder: {current}")
+            except OSError as e:
+                logging.warning(f"Cannot remove folder {current}: {e}")
+                break
+            current = current.parent
+
+
 def remove_empty_folders(path: Path, dry_run: bool = False) -> None:
     if not path.is_dir():
         return
@@ -292,11 +805,20 @@ def remove_empty_folders(path: Path, dry_run: bool = False) -> None:
             logging.warning(f"Cannot remove folder {root}: {e}")
 
 
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
 def print_summary(
     summary: RunSummary,
     dry_run: bool,
     report_path: Optional[Path] = None,
     meta: Optional[Dict[str, str]] = None,
+    preflight: Optional[PreflightEstimate] = None,
 ) -> None:
     print("\n" + "=" * 40)
     print("📊 SUMMARY REPORT")
@@ -310,6 +832,9 @@ def print_summary(
     print(f"Copied      : {summary.copied}")
     print(f"Renamed     : {summary.renamed}")
     print(f"Skipped     : {summary.skipped}")
+    if not dry_run:
+        print(f"Transferred : {format_bytes(summary.bytes_transferred)} ({format_bytes(summary.throughput)}/s)")
+        print(f"Busy time   : {summary.transfer_seconds:.2f}s (+{summary.throttled_seconds:.2f}s throttled)")
     print("\nBy category:")
     for category, count in summary.by_category.items():
         print(f"  - {category}: {count}")
@@ -319,11 +844,240 @@ def print_summary(
         report_path.parent.mkdir(parents=True, exist_ok=True)
         report = summary.to_dict()
         report.update({"mode": "dry-run" if dry_run else "real", "meta": meta or {}})
+        if preflight is not None:
+            report["preflight"] = preflight.to_dict()
         with report_path.open("w", encoding="utf-8") as report_file:
             json.dump(report, report_file, indent=2)
         print(f"Report written to {report_path}")
 
 
+# ================= THROTTLING =================
+
+class TokenBucket:
+    """Token bucket allowing bursts of up to one second's worth of ``rate``."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def consume(self, amount: float) -> float:
+        """Take ``amount`` tokens and return how long the caller must wait to stay within the rate."""
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class TransferThrottle:
+    """Paces file operations by byte and op budgets, with optional latency-based backoff.
+
+    Backoff compares like with like: per-operation overhead (renames and small copies)
+    and copy throughput (copies of at least ``THROUGHPUT_FLOOR`` bytes) each keep their
+    own moving average and baseline, so a mix of file sizes does not look like contention.
+    """
+
+    BACKOFF_THRESHOLD = 3.0  # back off once a signal is this many times worse than its baseline
+    MAX_BACKOFF = 2.0
+    THROUGHPUT_FLOOR = 1024 * 1024
+    BASELINE_DRIFT = 0.05  # how quickly a baseline follows a sustained change
+
+    def __init__(
+        self,
+        summary: RunSummary,
+        max_bytes_per_sec: Optional[float] = None,
+        max_ops_per_sec: Optional[float] = None,
+        adaptive: bool = False,
+    ) -> None:
+        self.summary = summary
+        self.byte_bucket = TokenBucket(max_bytes_per_sec) if max_bytes_per_sec else None
+        self.op_bucket = TokenBucket(max_ops_per_sec) if max_ops_per_sec else None
+        self.adaptive = adaptive
+        self.backoff = 0.0
+        self.op_avg: Optional[float] = None
+        self.op_baseline: Optional[float] = None
+        self.rate_avg: Optional[float] = None
+        self.rate_baseline: Optional[float] = None
+        self.started = 0.0
+        self.throttled_at_start = 0.0
+
+    @property
+    def chunk_size(self) -> int:
+        # Roughly a tenth of a second's budget per chunk keeps the pacing smooth.
+        if not self.byte_bucket:
+            return 1024 * 1024
+        return int(min(1024 * 1024, max(64 * 1024, self.byte_bucket.rate / 10)))
+
+    def wait(self, delay: float) -> None:
+        if delay > 0:
+            time.sleep(delay)
+            self.summary.throttled_seconds += delay
+
+    def before(self) -> None:
+        delay = self.backoff
+        if self.op_bucket:
+            delay = max(delay, self.op_bucket.consume(1))
+        self.wait(delay)
+        self.started = time.monotonic()
+        self.throttled_at_start = self.summary.throttled_seconds
+
+    def consume_bytes(self, amount: int) -> None:
+        if self.byte_bucket and amount:
+            self.wait(self.byte_bucket.consume(amount))
+
+    def after(self, size: int) -> None:
+        throttled = self.summary.throttled_seconds - self.throttled_at_start
+        elapsed = max(time.monotonic() - self.started - throttled, 1e-9)
+        self.summary.bytes_transferred += size
+        self.summary.transfer_seconds += elapsed
+        if not self.adaptive:
+            return
+
+        contended = False
+        if size >= self.THROUGHPUT_FLOOR:
+            rate = size / elapsed
+            self.rate_avg = rate if self.rate_avg is None else 0.8 * self.rate_avg + 0.2 * rate
+            if self.rate_baseline is None or self.rate_avg > self.rate_baseline:
+                self.rate_baseline = self.rate_avg
+            else:
+                self.rate_baseline -= (self.rate_baseline - self.rate_avg) * self.BASELINE_DRIFT
+            contended = self.rate_avg * self.BACKOFF_THRESHOLD < self.rate_baseline
+        else:
+            self.op_avg = elapsed if self.op_avg is None else 0.8 * self.op_avg + 0.2 * elapsed
+            if self.op_baseline is None or self.op_avg < self.op_baseline:
+                self.op_baseline = self.op_avg
+            else:
+                self.op_baseline += (self.op_avg - self.op_baseline) * self.BASELINE_DRIFT
+            contended = self.op_avg > self.op_baseline * self.BACKOFF_THRESHOLD
+
+        if contended:
+            self.backoff = min(self.MAX_BACKOFF, max(0.01, self.backoff * 2))
+        else:
+            self.backoff = self.backoff / 2 if self.backoff > 0.001 else 0.0
+
+
+def throttled_copy(src: Path, dst: Path, throttle: TransferThrottle) -> None:
+    """Copy in chunks, taking byte tokens per chunk so the limit holds within a single large file."""
+    try:
+        with src.open("rb") as source, dst.open("xb") as target:
+            while True:
+                chunk = source.read(throttle.chunk_size)
+                if not chunk:
+                    break
+                throttle.consume_bytes(len(chunk))
+                target.write(chunk)
+        shutil.copystat(src, dst)
+    except BaseException:
+        try:
+            dst.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def set_io_priority(level: str) -> bool:
+    if platform.system() != "Linux":
+        logging.warning("I/O priority is only supported on Linux, ignoring --io-priority")
+        return False
+    syscall_nr = IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if syscall_nr is None:
+        logging.warning(f"ioprio_set is not known for {platform.machine()}, ignoring --io-priority")
+        return False
+    io_class, io_level = IOPRIO_CLASSES[level]
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.syscall(syscall_nr, IOPRIO_WHO_PROCESS, 0, (io_class << IOPRIO_CLASS_SHIFT) | io_level) != 0:
+        logging.warning(f"ioprio_set failed: {os.strerror(ctypes.get_errno())}")
+        return False
+    logging.info(f"I/O priority set to {level}")
+    return True
+
+
+# ================= PRE-FLIGHT =================
+
+def nearest_existing(path: Path) -> Path:
+    while not path.exists() and path.parent != path:
+        path = path.parent
+    return path
+
+
+def free_space(path: Path) -> Optional[int]:
+    target = nearest_existing(path)
+    try:
+        if hasattr(os, "statvfs"):
+            stats = os.statvfs(target)
+            return stats.f_bavail * stats.f_frsize
+        return shutil.disk_usage(target).free
+    except OSError as e:
+        logging.warning(f"Cannot read free space for {target}: {e}")
+        return None
+
+
+def calibrate_transfer(estimate: PreflightEstimate, destination_root: Path, settings: OrganizerSettings) -> None:
+    """Time a rename, plus a small fsynced write when data will be copied, inside the destination folder."""
+    if not destination_root.is_dir():
+        logging.info(f"Destination {destination_root} does not exist yet, skipping calibration probe")
+        return
+    try:
+        fd, probe_name = tempfile.mkstemp(prefix=".organizer_probe_", dir=destination_root)
+    except OSError as e:
+        logging.warning(f"Cannot write calibration probe in {destination_root}: {e}")
+        return
+    logging.info(f"Writing calibration probe to {probe_name}")
+    probe = Path(probe_name)
+    try:
+        with os.fdopen(fd, "wb") as probe_file:
+            if estimate.copy_bytes:
+                probe_size = min(CALIBRATION_PROBE_BYTES, max(estimate.copy_bytes, 64 * 1024))
+                payload = os.urandom(probe_size)
+                started = time.monotonic()
+                probe_file.write(payload)
+                probe_file.flush()
+                os.fsync(probe_file.fileno())
+                estimate.copy_rate = probe_size / max(time.monotonic() - started, 1e-6)
+
+        renamed = probe.with_name(probe.name + ".renamed")
+        started = time.monotonic()
+        os.replace(probe, renamed)
+        estimate.op_seconds = time.monotonic() - started
+        probe = renamed
+    except OSError as e:
+        logging.warning(f"Calibration probe failed in {destination_root}: {e}")
+    finally:
+        try:
+            probe.unlink()
+        except OSError:
+            pass
+
+    # Throttling caps what the real run can achieve.
+    if estimate.copy_rate and settings.max_bytes_per_sec:
+        estimate.copy_rate = min(estimate.copy_rate, settings.max_bytes_per_sec)
+    if estimate.op_seconds is not None and settings.max_ops_per_sec:
+        estimate.op_seconds = max(estimate.op_seconds, 1 / settings.max_ops_per_sec)
+
+
+def print_preflight(estimate: PreflightEstimate, destination_root: Path) -> None:
+    print("\n" + "=" * 40)
+    print("🧮 PRE-FLIGHT ESTIMATE")
+    print("=" * 40)
+    print(f"Files       : {estimate.files} ({format_bytes(estimate.total_bytes)})")
+    print(f"Renames     : {estimate.rename_ops} (same device)")
+    print(f"Copies      : {estimate.copy_ops} ({format_bytes(estimate.copy_bytes)} to write)")
+    if estimate.free_bytes is not None:
+        print(f"Free space  : {format_bytes(estimate.free_bytes)} on {destination_root}")
+    if estimate.copy_rate:
+        print(f"Probe speed : {format_bytes(estimate.copy_rate)}/s")
+    seconds = estimate.estimated_seconds
+    if seconds is not None:
+        print(f"Est. time   : {seconds:.2f}s")
+    elif estimate.files:
+        print("Est. time   : unknown (destination not probed)")
+    if not estimate.fits:
+        msg = "[X] Not enough free space on the destination - a real run will be refused."
+        print(msg)
+        logging.warning(msg)
+
+
 # ================= HISTORY =================
 
 def load_history(history_path: Path) -> List[dict]:
@@ -440,11 +1194,28 @@ def clean_folder(settings: OrganizerSettings) -> None:
     if not abs_path.is_dir():
         print(f"[X] Folder not found: {abs_path}")
         return
+    if settings.files_from is not None and str(settings.files_from) != "-":
+        # Pipes and process substitution (/dev/fd/N) are fine; only missing paths and folders are not.
+        if not settings.files_from.exists():
+            print(f"[X] File list not found: {settings.files_from}")
+            return
+        if settings.files_from.is_dir():
+            print(f"[X] File list is a folder: {settings.files_from}")
+            return
+        if not os.access(settings.files_from, os.R_OK):
+            print(f"[X] File list not readable: {settings.files_from}")
+            return
     if not settings.dry_run and not settings.confirm:
         print("[!] Real run detected. Use --confirm to proceed.")
         return
 
     categories = load_categories(settings.config_path, merge_defaults=settings.merge_defaults)
+    rules: Optional[RuleSet] = None
+    if settings.rules_path:
+        rules = load_rules(settings.rules_path)
+        if rules is None:
+            print(" Fix the rules file or drop --rules; refusing to organize without the requested rules.")
+            return
     history: List[dict] = []
     summary = RunSummary()
 
@@ -453,8 +1224,9 @@ def clean_folder(settings: OrganizerSettings) -> None:
         print("[!]  DRY RUN MODE ENABLED - NO FILES WILL BE MOVED")
         print("=" * 60)
 
-    current_script = Path(sys.argv[0]).name
     target_category_folders = {destination_root / c for c in categories}
+    if rules:
+        target_category_folders.update(destination_root / c for c in rules.categories)
 
     # Avoid re-processing destination when it lives inside the source tree.
     skip_paths = set()
@@ -464,95 +1236,134 @@ def clean_folder(settings: OrganizerSettings) -> None:
     except ValueError:
         pass
 
-    for root, dirs, files in os.walk(abs_path):
-        root_path = Path(root)
-        depth = len(root_path.relative_to(abs_path).parts)
-        if settings.max_depth is not None and depth >= settings.max_depth:
-            dirs[:] = []
-
-        dirs[:] = [
-            d
-            for d in dirs
-            if d not in IGNORED_DIRS
-            and (settings.include_hidden or not d.startswith("."))
-            and not matches_exclude(root_path / d, settings.exclude_patterns)
-            and (root_path / d) not in target_category_folders
-            and (root_path / d) not in skip_paths
-        ]
-
-        for filename in files:
-            file_path = root_path / filename
-            if not settings.include_hidden and filename.startswith("."):
-                summary.skipped += 1
-                continue
-
-            if filename in {current_script, LOG_FILE, HISTORY_FILE, CONFIG_FILE}:
-                summary.skipped += 1
-                continue
-
-            if matches_exclude(file_path, settings.exclude_patterns):
-                summary.skipped += 1
-                continue
-
-            summary.total_scanned += 1
+    pruned_dirs = target_category_folders | skip_paths
+    destination_dev = nearest_existing(destination_root).stat().st_dev
+    estimate = PreflightEstimate()
+    preflight_checked = False
+    planned: Iterable[Tuple[Path, str, Path, os.stat_result]] = plan_operations(
+        iter_candidates(abs_path, settings, pruned_dirs, summary, settings.files_from),
+        categories,
+        destination_root,
+        settings,
+        summary,
+        rules,
+    )
 
-            _, extension = os.path.splitext(filename)
-            category = get_category(extension, categories, filepath=file_path)
-            target_folder = destination_root / category
+    # Copies need free space on the destination, so check capacity before touching anything.
+    if not settings.dry_run and (settings.mode == "copy" or abs_path.stat().st_dev != destination_dev):
+        # Keep the plan so files are listed, categorised and stat-ed only once (and a piped list is read once).
+        planned = list(planned)
+        for _, _, _, file_stat in planned:
+            estimate.add(file_stat.st_size, file_stat.st_dev == destination_dev, settings.mode)
+        estimate.free_bytes = free_space(destination_root)
+        preflight_checked = True
+        if not estimate.fits:
+            print(
+                f"[X] REFUSING to run: {format_bytes(estimate.copy_bytes)} to copy but only "
+                f"{format_bytes(estimate.free_bytes or 0)} free on {destination_root}"
+            )
+            logging.error(f"Pre-flight check failed, not enough free space on {destination_root}")
+            return
 
-            if file_path.parent == target_folder:
-                summary.skipped += 1
-                continue
+    source_folders: Set[Path] = set()
+    target_devices: Dict[Path, int] = {}
+    throttle = TransferThrottle(
+        summary,
+        max_bytes_per_sec=settings.max_bytes_per_sec,
+        max_ops_per_sec=settings.max_ops_per_sec,
+        adaptive=settings.adaptive_throttle,
+    )
+    if settings.io_priority and not settings.dry_run:
+        set_io_priority(settings.io_priority)
 
-            summary.by_category[category] = summary.by_category.get(category, 0) + 1
+    for file_path, category, target_folder, file_stat in planned:
+        filename = file_path.name
+        if settings.dry_run:
+            estimate.add(file_stat.st_size, file_stat.st_dev == destination_dev, settings.mode)
 
-            if not target_folder.exists() and not settings.dry_run:
-                target_folder.mkdir(parents=True)
+        if not target_folder.exists() and not settings.dry_run:
+            target_folder.mkdir(parents=True)
 
-            if (target_folder / filename).exists():
-                new_filename = get_unique_filename(target_folder, filename)
-                if settings.dry_run:
-                    msg = f"[DRY RUN] Rename conflict: {filename} -> {new_filename}"
-                    print(msg)
-                    logging.warning(msg)
-            else:
-                new_filename = filename
+        if (target_folder / filename).exists():
+            new_filename = get_unique_filename(target_folder, filename)
+            if settings.dry_run:
+                msg = f"[DRY RUN] Rename conflict: {filename} -> {new_filename}"
+                print(msg)
+                logging.warning(msg)
+        else:
+            new_filename = filename
 
-            if new_filename != filename and not settings.dry_run:
-                summary.renamed += 1
-                logging.warning(f"Renamed {filename} -> {new_filename}")
+        if new_filename != filename and not settings.dry_run:
+            summary.renamed += 1
+            logging.warning(f"Renamed {filename} -> {new_filename}")
 
-            destination_path = target_folder / new_filename
+        destination_path = target_folder / new_filename
 
-            if settings.dry_run:
-                logging.info(f"[DRY RUN] {file_path} -> {destination_path}")
-            else:
-                try:
-                    if settings.mode == "copy":
+        if settings.dry_run:
+            logging.info(f"[DRY RUN] {file_path} -> {destination_path}")
+        else:
+            try:
+                # Same-device moves are renames; only copies cost data transfer.
+                size = file_stat.st_size
+                if settings.mode == "move":
+                    if target_folder not in target_devices:
+                        target_devices[target_folder] = target_folder.stat().st_dev
+                    if file_stat.st_dev == target_devices[target_folder]:
+                        size = 0
+                # Only regular files are streamed; symlinks and special files keep shutil's handling.
+                chunked = bool(throttle.byte_bucket) and stat.S_ISREG(file_stat.st_mode)
+                throttle.before()
+                if settings.mode == "copy":
+                    if chunked:
+                        throttled_copy(file_path, destination_path, throttle)
+                    else:
                         shutil.copy2(str(file_path), str(destination_path))
-                        summary.copied += 1
-                        logging.info(f"Copied {file_path} -> {destination_path}")
+                    throttle.after(size)
+                    summary.copied += 1
+                    logging.info(f"Copied {file_path} -> {destination_path}")
+                else:
+                    if size and chunked:
+                        # Cross-device move: copy at the limited rate, then drop the source like shutil.move.
+                        throttled_copy(file_path, destination_path, throttle)
+                        file_path.unlink()
                     else:
                         shutil.move(str(file_path), str(destination_path))
-                        summary.moved += 1
-                        history.append({"src": str(file_path), "dst": str(destination_path)})
-                        logging.info(f"Moved {file_path} -> {destination_path}")
-                except Exception as e:  # pylint: disable=broad-except
-                    logging.error(f"Failed to move {file_path}: {e}")
+                    throttle.after(size)
+                    summary.moved += 1
+                    source_folders.add(file_path.parent)
+                    history.append({"src": str(file_path), "dst": str(destination_path)})
+                    logging.info(f"Moved {file_path} -> {destination_path}")
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error(f"Failed to move {file_path}: {e}")
+
+    if settings.dry_run:
+        estimate.free_bytes = free_space(destination_root)
+        if estimate.files:
+            calibrate_transfer(estimate, destination_root, settings)
+        print_preflight(estimate, destination_root)
 
     if not settings.dry_run:
         if history and settings.mode == "move":
             save_history_entry(abs_path, history, settings.history_path, destination_root)
         if settings.cleanup_empty:
             print("Cleaning up empty folders...")
-            remove_empty_folders(abs_path)
+            if settings.files_from is not None:
+                remove_empty_parents(source_folders, abs_path)
+            else:
+                remove_empty_folders(abs_path)
 
     meta = {
         "Source": str(abs_path),
         "Destination": str(destination_root),
         "Mode": settings.mode,
     }
-    print_summary(summary, settings.dry_run, report_path=settings.report_path, meta=meta)
+    print_summary(
+        summary,
+        settings.dry_run,
+        report_path=settings.report_path,
+        meta=meta,
+        preflight=estimate if settings.dry_run or preflight_checked else None,
+    )
 
 
 # ================= ENTRY POINT =================
@@ -576,6 +1387,12 @@ if __name__ == "__main__":
         max_depth=args.max_depth,
         console_log=args.console_log,
         report_path=args.report,
+        files_from=args.files_from,
+        max_bytes_per_sec=args.max_bytes_per_sec,
+        max_ops_per_sec=args.max_ops_per_sec,
+        io_priority=args.io_priority,
+        adaptive_throttle=args.adaptive_throttle,
+        rules_path=args.rules,
     )
 
     configure_logging(settings.log_path, console=settings.console_log)